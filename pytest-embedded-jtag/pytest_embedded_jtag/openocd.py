@@ -5,7 +5,7 @@ import time
 from typing import AnyStr, Optional
 
 from pytest_embedded.log import DuplicateStdoutPopen
-from pytest_embedded.utils import to_bytes, to_str
+from pytest_embedded.utils import to_bytes, to_str, to_str_from_bytes
 
 from ._telnetlib.telnetlib import Telnet
 
@@ -68,12 +68,13 @@ class OpenOcd(DuplicateStdoutPopen):
         # read all output already sent
         resp = self.telnet.read_very_eager()
         if resp:
-            logging.debug(f'{self.SOURCE} <-: {to_str(resp)}')
+            logging.debug(f'{self.SOURCE} <-: {to_str_from_bytes(resp)}')
 
         logging.debug(f'{self.SOURCE} ->: {to_str(s)}')
         self.telnet.write(to_bytes(s, '\n'))
 
         resp = self.telnet.read_until(b'>')
 
-        logging.debug(f'{self.SOURCE} <-: {to_str(resp)}')
-        return to_str(resp)
+        resp_str = to_str_from_bytes(resp)
+        logging.debug(f'{self.SOURCE} <-: {resp_str}')
+        return resp_str
@@ -13,6 +13,9 @@ from . import DEFAULT_IMAGE_FN
 if t.TYPE_CHECKING:
     from .app import QemuApp
 
+# absolute paths of the images known to exist, checked only once per session
+_EXISTING_IMAGES: t.Set[str] = set()
+
 
 class Qemu(DuplicateStdoutPopen):
     """
@@ -31,6 +34,11 @@ class Qemu(DuplicateStdoutPopen):
 
     QEMU_DEFAULT_QMP_FMT = '-qmp tcp:127.0.0.1:{},server,wait=off'
 
+    # default args are class constants, split them only once
+    _QEMU_DEFAULT_ARGS_TOKENS: t.ClassVar[t.Dict[str, t.Tuple[str, ...]]] = {
+        QEMU_DEFAULT_ARGS: tuple(shlex.split(QEMU_DEFAULT_ARGS)),
+    }
+
     def __init__(
         self,
         qemu_image_path: t.Optional[str] = None,
@@ -50,15 +58,18 @@ class Qemu(DuplicateStdoutPopen):
         self.app = app
 
         image_path = qemu_image_path or DEFAULT_IMAGE_FN
-        if not os.path.exists(image_path):
-            raise ValueError(f"QEMU image path doesn't exist: {image_path}")
+        _abs_image_path = os.path.abspath(image_path)
+        if _abs_image_path not in _EXISTING_IMAGES:
+            if not os.path.exists(image_path):
+                raise ValueError(f"QEMU image path doesn't exist: {image_path}")
+            _EXISTING_IMAGES.add(_abs_image_path)
 
         qemu_prog_path = qemu_prog_path or self.qemu_prog_name
 
         if qemu_cli_args:
             qemu_cli_args = qemu_cli_args.strip('"').strip("'")
-        qemu_cli_args = shlex.split(qemu_cli_args or self.qemu_default_args)
-        qemu_extra_args = shlex.split(qemu_extra_args or '')
+        qemu_cli_args = shlex.split(qemu_cli_args) if qemu_cli_args else list(self._default_args_tokens())
+        qemu_extra_args = shlex.split(qemu_extra_args) if qemu_extra_args else ()
 
         self.qmp_addr = None
         self.qmp_port = None
@@ -80,13 +91,67 @@ class Qemu(DuplicateStdoutPopen):
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 s.bind((self.qmp_addr, 0))
                 _, self.qmp_port = s.getsockname()
-            qemu_cli_args += shlex.split(self.QEMU_DEFAULT_QMP_FMT.format(self.qmp_port))
+            qemu_cli_args.extend(self.qmp_tcp_args(self.qmp_port))
+
+        cmd = [qemu_prog_path]
+        cmd.extend(qemu_cli_args)
+        cmd.extend(qemu_extra_args)
+        cmd.extend(('-drive', f'file={image_path},if=mtd,format=raw'))
 
         super().__init__(
-            cmd=[qemu_prog_path, *qemu_cli_args, *qemu_extra_args, '-drive', f'file={image_path},if=mtd,format=raw'],
+            cmd=cmd,
             **kwargs,
         )
 
+    @staticmethod
+    def strap_mode_args(value: t.Union[int, str]) -> t.List[str]:
+        """
+        Tokenized `QEMU_STRAP_MODE_FMT`
+
+        Args:
+            value: strap mode value
+
+        Returns:
+            QEMU CLI arguments
+        """
+        return ['-global', f'driver=esp32.gpio,property=strap_mode,value={value}']
+
+    @staticmethod
+    def serial_tcp_args(port: int) -> t.List[str]:
+        """
+        Tokenized `QEMU_SERIAL_TCP_FMT`
+
+        Args:
+            port: TCP port
+
+        Returns:
+            QEMU CLI arguments
+        """
+        return ['-serial', f'tcp::{port},server,nowait']
+
+    @staticmethod
+    def qmp_tcp_args(port: int) -> t.List[str]:
+        """
+        Tokenized `QEMU_DEFAULT_QMP_FMT`
+
+        Args:
+            port: TCP port
+
+        Returns:
+            QEMU CLI arguments
+        """
+        return ['-qmp', f'tcp:127.0.0.1:{port},server,wait=off']
+
+    @staticmethod
+    def invalidate_image_path(image_path: str) -> None:
+        """
+        Forget that `image_path` exists, it will be checked again at the next QEMU instantiation.
+
+        Args:
+            image_path: QEMU image path
+        """
+        _EXISTING_IMAGES.discard(os.path.abspath(image_path))
+
     @property
     def qemu_prog_name(self):
         if self.app:
@@ -105,6 +170,14 @@ class Qemu(DuplicateStdoutPopen):
 
         return self.QEMU_DEFAULT_ARGS
 
+    def _default_args_tokens(self) -> t.Tuple[str, ...]:
+        default_args = self.qemu_default_args
+        tokens = self._QEMU_DEFAULT_ARGS_TOKENS.get(default_args)
+        if tokens is None:
+            tokens = self._QEMU_DEFAULT_ARGS_TOKENS[default_args] = tuple(shlex.split(default_args))
+
+        return tokens
+
     def qmp_execute_cmd(self, execute, arguments=None):
         response = None
 
@@ -1,4 +1,5 @@
 import os
+import shlex
 import shutil
 import xml.etree.ElementTree as ET
 
@@ -158,3 +159,49 @@ def test_qemu_use_idf_mixin_methods(testdir):
     assert junit_report.attrib['failures'] == '1'
     assert junit_report.attrib['skipped'] == '0'
     assert junit_report.attrib['tests'] == '2'
+
+
+def test_qemu_image_path_exists_cache(monkeypatch, tmp_path):
+    from pytest_embedded.log import DuplicateStdoutPopen
+    from pytest_embedded_qemu import Qemu
+
+    # don't spawn any process
+    monkeypatch.setattr(DuplicateStdoutPopen, '__init__', lambda *_args, **_kwargs: None)
+
+    image_path = str(tmp_path / 'flash_image.bin')
+    with pytest.raises(ValueError):
+        Qemu(image_path, 'qemu-system-xtensa')
+
+    open(image_path, 'wb').close()
+    Qemu(image_path, 'qemu-system-xtensa')
+
+    # cached, not checked again
+    monkeypatch.setattr(os.path, 'exists', lambda _: False)
+    Qemu(image_path, 'qemu-system-xtensa')
+
+    Qemu.invalidate_image_path(image_path)
+    with pytest.raises(ValueError):
+        Qemu(image_path, 'qemu-system-xtensa')
+
+
+@pytest.mark.parametrize('qemu_cli_args', [None, '', '""', "''"])
+def test_qemu_empty_cli_args_use_default(monkeypatch, tmp_path, qemu_cli_args):
+    from pytest_embedded.log import DuplicateStdoutPopen
+    from pytest_embedded_qemu import Qemu
+
+    cmds = []
+    monkeypatch.setattr(DuplicateStdoutPopen, '__init__', lambda _self, cmd, **_kwargs: cmds.append(cmd))
+
+    image_path = str(tmp_path / 'flash_image.bin')
+    open(image_path, 'wb').close()
+    Qemu(image_path, 'qemu-system-xtensa', qemu_cli_args)
+
+    assert cmds[0][1:4] == shlex.split(Qemu.QEMU_DEFAULT_ARGS)
+
+
+def test_qemu_tokenized_args():
+    from pytest_embedded_qemu import Qemu
+
+    assert Qemu.strap_mode_args(0x0F) == shlex.split(Qemu.QEMU_STRAP_MODE_FMT.format(0x0F))
+    assert Qemu.serial_tcp_args(5555) == shlex.split(Qemu.QEMU_SERIAL_TCP_FMT.format(5555))
+    assert Qemu.qmp_tcp_args(4488) == shlex.split(Qemu.QEMU_DEFAULT_QMP_FMT.format(4488))
@@ -10,7 +10,7 @@ import pexpect
 from .app import App
 from .log import PexpectProcess
 from .unity import UNITY_SUMMARY_LINE_REGEX, TestSuite
-from .utils import Meta, _InjectMixinCls, remove_asci_color_code, to_bytes, to_list
+from .utils import Meta, _InjectMixinCls, remove_asci_color_code, to_bytes, to_iterable, to_list
 
 
 class Dut(_InjectMixinCls):
@@ -87,7 +87,7 @@ class Dut(_InjectMixinCls):
                 else:
                     res.append(self.pexpect_proc.match)
 
-                for nm_pattern in to_list(not_matching):
+                for nm_pattern in to_iterable(not_matching):
                     if isinstance(nm_pattern, str):
                         nm_pattern = re.compile(nm_pattern.encode())
                     if isinstance(nm_pattern.pattern, str):
@@ -21,7 +21,7 @@ if t.TYPE_CHECKING:
 
 from . import App, Dut
 from .log import MessageQueue, PexpectProcess
-from .utils import FIXTURES_SERVICES, ClassCliOptions, to_str
+from .utils import FIXTURES_SERVICES, ClassCliOptions, to_str_from_bytes
 
 
 def _drop_none_kwargs(kwargs: t.Dict[t.Any, t.Any]):
@@ -60,7 +60,7 @@ def _listen(q: MessageQueue, filepath: str, with_timestamp: bool = True, count:
             fw.write(msg)
             fw.flush()
 
-        _s = to_str(msg)
+        _s = to_str_from_bytes(msg)
         if not _s:
             continue
 
@@ -60,7 +60,7 @@ class PexpectProcess(pexpect.fdpexpect.fdspawn):
     @property
     def buffer_debug_str(self):
         return textwrap.shorten(
-            remove_asci_color_code(to_str(self.buffer)),
+            remove_asci_color_code(self.buffer),
             width=200,
             placeholder=f'... (total {len(self.buffer)} bytes)',
         )
@@ -51,6 +51,7 @@ from .utils import (
     PackageNotInstalledError,
     UnknownServiceError,
     find_by_suffix,
+    to_iterable,
     to_list,
     utcnow_str,
 )
@@ -629,9 +630,9 @@ def test_case_tempdir(test_case_name: str, session_tempdir: str) -> str:
 
 @pytest.fixture
 @multi_dut_fixture
-def _meta(test_case_tempdir, port_target_cache, port_app_cache, logfile_extension) -> Meta:
+def _meta(test_case_tempdir, port_target_cache, port_app_cache, logfile_extension, cache_dir) -> Meta:
     """function scoped _meta info"""
-    return Meta(test_case_tempdir, port_target_cache, port_app_cache, logfile_extension)
+    return Meta(test_case_tempdir, port_target_cache, port_app_cache, logfile_extension, cache_dir)
 
 
 @pytest.fixture
@@ -1165,7 +1166,7 @@ def unity_tester(dut: t.Union['IdfDut', t.Tuple['IdfDut']]) -> t.Optional['CaseT
         yield None
     else:
         # all dut instance must be IdfDut to use this fixture
-        for _dut in to_list(dut):
+        for _dut in to_iterable(dut):
             if not isinstance(_dut, IdfDut):
                 yield None
 
@@ -1292,7 +1293,7 @@ class PytestEmbedded:
     def pytest_runtest_call(self, item: Function):
         # raise dut failed cases
         if 'dut' in item.funcargs:
-            duts = [dut for dut in to_list(item.funcargs['dut']) if isinstance(dut, Dut)]
+            duts = [dut for dut in to_iterable(item.funcargs['dut']) if isinstance(dut, Dut)]
             self._raise_dut_failed_cases_if_exists(duts)  # type: ignore
 
     @pytest.hookimpl(trylast=True)  # combine all possible junit reports should be the last step
@@ -1,22 +1,28 @@
 import dataclasses
 import datetime
+import dbm
 import functools
 import importlib
 import logging
 import os
 import re
+import shelve
+import sys
+import types
 import typing as t
 from dataclasses import dataclass
 
 if t.TYPE_CHECKING:
     from . import App
 
+_log = logging.getLogger(__name__)
+
 #############
 # Constants #
 #############
 BASE_LIB_NAME = 'pytest-embedded'
 
-SERVICE_LIB_NAMES = {
+SERVICE_LIB_NAMES = types.MappingProxyType({
     'serial': f'{BASE_LIB_NAME}-serial',
     'esp': f'{BASE_LIB_NAME}-serial-esp',
     'idf': f'{BASE_LIB_NAME}-idf',
@@ -24,17 +30,19 @@ SERVICE_LIB_NAMES = {
     'qemu': f'{BASE_LIB_NAME}-qemu',
     'arduino': f'{BASE_LIB_NAME}-arduino',
     'wokwi': f'{BASE_LIB_NAME}-wokwi',
-}
+})
 
-FIXTURES_SERVICES = {
-    'app': ['base', 'idf', 'qemu', 'arduino'],
-    'serial': ['serial', 'jtag', 'esp', 'idf', 'arduino'],
-    'openocd': ['jtag'],
-    'gdb': ['jtag'],
-    'qemu': ['qemu'],
-    'wokwi': ['wokwi'],
-    'dut': ['base', 'serial', 'jtag', 'qemu', 'idf', 'wokwi'],
-}
+_SERVICE_NAMES_JOINED = ','.join(SERVICE_LIB_NAMES.keys())
+
+FIXTURES_SERVICES = types.MappingProxyType({
+    'app': frozenset({'base', 'idf', 'qemu', 'arduino'}),
+    'serial': frozenset({'serial', 'jtag', 'esp', 'idf', 'arduino'}),
+    'openocd': frozenset({'jtag'}),
+    'gdb': frozenset({'jtag'}),
+    'qemu': frozenset({'qemu'}),
+    'wokwi': frozenset({'wokwi'}),
+    'dut': frozenset({'base', 'serial', 'jtag', 'qemu', 'idf', 'wokwi'}),
+})
 
 
 @dataclass
@@ -52,6 +60,9 @@ _MIXIN_REQUIRED_SERVICES = {
 
 _MIXIN_REQUIRED_SERVICES_KEY = '_based_on_services'
 
+# never equal to any cached value, unlike `None`
+_SENTINEL = object()
+
 
 #######################
 # Errors and Warnings #
@@ -62,7 +73,7 @@ class UserHint(Warning):
 
 class UnknownServiceError(SystemExit):
     def __init__(self, service: str) -> None:
-        super().__init__(f'Unknown service "{service}". Valid options: {",".join(SERVICE_LIB_NAMES.keys())} ')
+        super().__init__(f'Unknown service "{service}". Valid options: {_SERVICE_NAMES_JOINED} ')
 
 
 class PackageNotInstalledError(SystemExit):
@@ -75,7 +86,7 @@ class PackageNotInstalledError(SystemExit):
 
 class RequireServiceError(SystemExit):
     def __init__(self, func_name: str, services: t.Union[str, t.List[str]]) -> None:
-        services_str = ','.join(to_list(services))
+        services_str = ','.join(to_iterable(services))
         super().__init__(
             f'function {func_name} requires enabling one of the service(s) {services_str}. '
             f'Please enable by passing CLI options "--embedded-services {services_str}". '
@@ -86,6 +97,35 @@ class RequireServiceError(SystemExit):
 #####################
 # Utility Functions #
 #####################
+def to_str_from_bytes(b: bytes) -> str:
+    """
+    Turn `bytes` to `str`. Use this instead of `to_str` when the input is known to be `bytes`
+
+    Args:
+        b: `bytes`
+
+    Returns:
+        utf8-decoded string
+    """
+    return b.decode('utf-8', errors='ignore')
+
+
+def to_bytes_from_str(s: str, ending: t.Optional[bytes] = None) -> bytes:
+    """
+    Turn `str` to `bytes`. Use this instead of `to_bytes` when the input is known to be `str`
+
+    Args:
+        s: `str`
+        ending: `bytes`, will add to the end of the result.
+
+    Returns:
+        utf8-encoded bytes
+    """
+    if ending:
+        return s.encode() + ending
+    return s.encode()
+
+
 def to_str(bytes_str: t.AnyStr) -> str:
     """
     Turn `bytes` or `str` to `str`
@@ -97,7 +137,7 @@ def to_str(bytes_str: t.AnyStr) -> str:
         utf8-decoded string
     """
     if isinstance(bytes_str, bytes):
-        return bytes_str.decode('utf-8', errors='ignore')
+        return to_str_from_bytes(bytes_str)
     return bytes_str
 
 
@@ -114,12 +154,9 @@ def to_bytes(bytes_str: t.AnyStr, ending: t.Optional[t.AnyStr] = None) -> bytes:
         utf8-encoded bytes
     """
     if isinstance(bytes_str, str):
-        bytes_str = bytes_str.encode()
-
-        if ending:
-            if isinstance(ending, str):
-                ending = ending.encode()
-            return bytes_str + ending
+        if isinstance(ending, str):
+            ending = ending.encode()
+        return to_bytes_from_str(bytes_str, ending)
 
     return bytes_str
 
@@ -134,25 +171,68 @@ def to_list(s: _T) -> t.List[_T]:
 
         - `list(s)` (List. If `s` is a tuple or a set.
         - itself. If `s` is a list.
+        - itself. If `s` is other types and falsy, e.g. `None`.
         - `[s]`. If `s` is other types.
     """
-    if not s:
-        return s
-
     if isinstance(s, set) or isinstance(s, tuple):
         return list(s)
     elif isinstance(s, list):
         return s
+    elif not s:
+        return s
     else:
         return [s]
 
 
-def find_by_suffix(suffix: str, path: str) -> t.List[str]:
+def to_iterable(s: t.Any) -> t.Iterable[t.Any]:
+    """
+    Like `to_list`, but without copying, for callers that only iterate over the result.
+
+    Args:
+        s: Anything
+
+    Returns:
+        Iterable
+
+        - itself. If `s` is a list, a tuple, or a set.
+        - `()`. If `s` is `None` or an empty string.
+        - `(s,)`. If `s` is other types.
+    """
+    if s is None or (isinstance(s, (str, bytes)) and not s):
+        return ()
+
+    if isinstance(s, (list, tuple, set)):
+        return s
+
+    return (s,)
+
+
+def find_by_suffix(suffix: t.Union[str, t.Tuple[str, ...]], path: str) -> t.List[str]:
+    """
+    Recursively find files under `path` whose names end with `suffix`. Symlinks to directories are not followed.
+
+    Args:
+        suffix: file name suffix, or a tuple of suffixes to match any of them
+        path: root directory
+
+    Returns:
+        list of file paths
+    """
     res = []
-    for root, _, files in os.walk(path):
-        for file in files:
-            if file.endswith(suffix):
-                res.append(os.path.join(root, file))
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+                elif entry.name.endswith(suffix):
+                    res.append(entry.path)
 
     return res
 
@@ -161,8 +241,8 @@ def utcnow_str() -> str:
     return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d_%H-%M-%S-%f')
 
 
-_ANSI_COLOR_CODE_RE = re.compile(
-    r"""
+# compiled lazily at the first use, most sessions never strip any color code
+_ANSI_COLOR_CODE_PATTERN = r"""
     \x1B  # ESC
     (?:   # 7-bit C1 Fe (except CSI)
         [@-Z\\-_]
@@ -172,18 +252,50 @@ _ANSI_COLOR_CODE_RE = re.compile(
         [ -/]*  # Intermediate bytes
         [@-~]   # Final byte
     )
-""",
-    re.VERBOSE,
-)
+"""
+
+_ANSI_COLOR_CODE_BYTES_PATTERN = rb'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])'
+
+
+@functools.lru_cache(maxsize=None)
+def _ansi_color_code_re() -> t.Pattern[str]:
+    return re.compile(_ANSI_COLOR_CODE_PATTERN, re.VERBOSE)
+
+
+@functools.lru_cache(maxsize=None)
+def _ansi_color_code_bytes_re() -> t.Pattern[bytes]:
+    return re.compile(_ANSI_COLOR_CODE_BYTES_PATTERN)
 
 
 def remove_asci_color_code(s: t.AnyStr) -> str:
+    """
+    Remove the ANSI escape sequences from `s`
+
+    Most log lines contain no ESC character at all, these are returned without running any pattern.
+    Otherwise `bytes` input is scanned as-is and only decoded once at the end.
+
+    Args:
+        s: `bytes` or `str`
+
+    Returns:
+        string without ANSI escape sequences
+    """
     if isinstance(s, bytes):
-        s = s.decode('utf-8', errors='ignore')
-    return _ANSI_COLOR_CODE_RE.sub('', s)
+        if b'\x1b' in s:
+            s = _ansi_color_code_bytes_re().sub(b'', s)
+        return s.decode('utf-8', errors='ignore')
+
+    if '\x1b' not in s:
+        return s
 
+    return _ansi_color_code_re().sub('', s)
 
-@dataclasses.dataclass
+
+# `slots` is supported by dataclasses since python 3.10
+_DATACLASS_SLOTS_KWARGS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclasses.dataclass(**_DATACLASS_SLOTS_KWARGS)
 class Meta:
     """
     Meta info for testing, session scope
@@ -193,42 +305,67 @@ class Meta:
     port_target_cache: t.Dict[str, str]
     port_app_cache: t.Dict[str, str]
     logfile_extension: str = '.log'
+    cache_dir: t.Optional[str] = None
+
+    def _update_port_target_cache_file(self, port: str, target: t.Optional[str]) -> None:
+        """
+        Write the port-target cache change through to the cache file, so the detected targets survive
+        even if the session is not torn down properly.
+
+        The port-app cache is not persisted on purpose, the apps may be rebuilt or re-flashed between sessions.
+        """
+        if not self.cache_dir:
+            return
+
+        _cache_file_path = os.path.join(self.cache_dir, 'port_target_cache')
+        try:
+            with shelve.open(_cache_file_path) as f:
+                if target is None:
+                    f.pop(port, None)
+                else:
+                    f[port] = target
+        except dbm.error as e:
+            _log.debug('failed to update port-target cache file %s: %s', _cache_file_path, e)
 
     def hit_port_target_cache(self, port: str, target: str) -> bool:
-        if self.port_target_cache.get(port, None) == target:
-            logging.debug('hit port-target cache: %s - %s', port, target)
+        if self.port_target_cache.get(port, _SENTINEL) == target:
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug('hit port-target cache: %s - %s', port, target)
             return True
 
         return False
 
     def set_port_target_cache(self, port: str, target: str) -> None:
         self.port_target_cache[port] = target
-        logging.debug('set port-target cache: %s - %s', port, target)
+        self._update_port_target_cache_file(port, target)
+        _log.debug('set port-target cache: %s - %s', port, target)
 
     def drop_port_target_cache(self, port: str) -> None:
         try:
             self.port_target_cache.pop(port)
-            logging.debug('drop port-target cache with port %s', port)
+            self._update_port_target_cache_file(port, None)
+            _log.debug('drop port-target cache with port %s', port)
         except KeyError:
-            logging.warning('no port-target cache with port %s', port)
+            _log.warning('no port-target cache with port %s', port)
 
     def hit_port_app_cache(self, port: str, app: 'App') -> bool:
-        if self.port_app_cache.get(port, None) == app.binary_path:
-            logging.debug('hit port-app cache: %s - %s', port, app.binary_path)
+        if self.port_app_cache.get(port, _SENTINEL) == app.binary_path:
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug('hit port-app cache: %s - %s', port, app.binary_path)
             return True
 
         return False
 
     def set_port_app_cache(self, port: str, app: 'App') -> None:
         self.port_app_cache[port] = app.binary_path
-        logging.debug('set port-app cache: %s - %s', port, app.binary_path)
+        _log.debug('set port-app cache: %s - %s', port, app.binary_path)
 
     def drop_port_app_cache(self, port: str) -> None:
         try:
             self.port_app_cache.pop(port)
-            logging.debug('drop port-app cache with port %s', port)
+            _log.debug('drop port-app cache with port %s', port)
         except KeyError:
-            logging.warning('no port-app cache with port %s', port)
+            _log.warning('no port-app cache with port %s', port)
 
 
 _ModuleType = type(importlib)
@@ -287,7 +424,7 @@ class _InjectMixinMeta(type):
         try:
             mixins = kwargs.pop('mixins', None)
             if mixins:
-                mixins = to_list(mixins)
+                mixins = to_iterable(mixins)
                 name = cls.__name__ + 'With' + 'And'.join([m.__name__ for m in mixins])
                 cls = type(name, tuple([*mixins, cls]), {})
 
@@ -297,7 +434,7 @@ class _InjectMixinMeta(type):
                     if m.__name__ not in _MIXIN_REQUIRED_SERVICES:
                         continue
 
-                    _based_on_services.update(to_list(_MIXIN_REQUIRED_SERVICES[m.__name__]))
+                    _based_on_services.update(to_iterable(_MIXIN_REQUIRED_SERVICES[m.__name__]))
                 kwargs[_MIXIN_REQUIRED_SERVICES_KEY] = sorted(_based_on_services)
         except KeyError:
             pass
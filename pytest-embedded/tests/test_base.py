@@ -632,3 +632,118 @@ def test_unclosed_file_handler(testdir):
         '-x',  # fail at the first fail
     )
     result.assert_outcomes(passed=1024)
+
+
+def test_remove_asci_color_code():
+    from pytest_embedded.utils import remove_asci_color_code
+
+    assert remove_asci_color_code('\x1b[0;32mI (0) Hello\x1b[0m') == 'I (0) Hello'
+    assert remove_asci_color_code(b'\x1b[0;32mI (0) Hello\x1b[0m\x1bP') == 'I (0) Hello'
+    assert remove_asci_color_code(b'no color code') == 'no color code'
+    assert remove_asci_color_code(b'') == ''
+
+
+def test_to_bytes_to_str():
+    from pytest_embedded.utils import to_bytes, to_str
+
+    assert to_bytes('foo') == b'foo'
+    assert to_bytes('foo', '\n') == b'foo\n'
+    assert to_bytes('foo', b'\r\n') == b'foo\r\n'
+    assert to_bytes(b'foo', '\n') == b'foo'
+    assert to_bytes('f' * 1024, '\n') == b'f' * 1024 + b'\n'
+
+    assert to_str(b'foo') == 'foo'
+    assert to_str('foo') == 'foo'
+    assert to_str(b'\xff' + b'f' * 1024) == 'f' * 1024
+
+
+def test_find_by_suffix(tmp_path):
+    from pytest_embedded.utils import find_by_suffix
+
+    (tmp_path / 'a' / 'b').mkdir(parents=True)
+    (tmp_path / 'foo.xml').touch()
+    (tmp_path / 'a' / 'bar.xml').touch()
+    (tmp_path / 'a' / 'b' / 'baz.log').touch()
+    (tmp_path / 'link').symlink_to(tmp_path / 'a', target_is_directory=True)
+
+    assert sorted(find_by_suffix('.xml', str(tmp_path))) == sorted([
+        str(tmp_path / 'foo.xml'),
+        str(tmp_path / 'a' / 'bar.xml'),
+    ])
+    assert len(find_by_suffix(('.xml', '.log'), str(tmp_path))) == 3
+    assert find_by_suffix('.xml', str(tmp_path / 'not_exists')) == []
+
+
+def test_meta_port_target_cache_file(tmp_path):
+    import shelve
+
+    from pytest_embedded.utils import Meta
+
+    meta = Meta(str(tmp_path), {}, {}, cache_dir=str(tmp_path))
+    meta.set_port_target_cache('/dev/ttyUSB0', 'esp32')
+    meta.set_port_target_cache('/dev/ttyUSB1', 'esp32c3')
+    meta.drop_port_target_cache('/dev/ttyUSB0')
+
+    with shelve.open(str(tmp_path / 'port_target_cache')) as f:
+        assert dict(f) == {'/dev/ttyUSB1': 'esp32c3'}
+
+
+def test_to_list():
+    from pytest_embedded.utils import to_list
+
+    _l = [1, 2]
+    assert to_list(_l) is _l
+    assert to_list((1, 2)) == [1, 2]
+    assert to_list({1}) == [1]
+    assert to_list(()) == []
+    assert to_list('foo') == ['foo']
+    assert to_list(None) is None
+
+
+def test_meta_port_cache_miss():
+    from pytest_embedded.app import App
+    from pytest_embedded.utils import Meta
+
+    meta = Meta('', {}, {})
+    assert not meta.hit_port_target_cache('/dev/ttyUSB0', None)
+
+    app = App()
+    app.binary_path = None
+    assert not meta.hit_port_app_cache('/dev/ttyUSB0', app)
+
+    meta.set_port_app_cache('/dev/ttyUSB0', app)
+    assert meta.hit_port_app_cache('/dev/ttyUSB0', app)
+
+
+def test_to_iterable():
+    from pytest_embedded.utils import to_iterable
+
+    _t = (1, 2)
+    assert to_iterable(_t) is _t
+    assert to_iterable('foo') == ('foo',)
+    assert to_iterable(None) == ()
+    assert to_iterable('') == ()
+
+
+def test_to_bytes_from_str_to_str_from_bytes():
+    from pytest_embedded.utils import to_bytes_from_str, to_str_from_bytes
+
+    assert to_bytes_from_str('foo') == b'foo'
+    assert to_bytes_from_str('foo', b'\n') == b'foo\n'
+    assert to_str_from_bytes(b'foo\xff') == 'foo'
+
+
+def test_meta_port_cache_log(caplog):
+    import logging
+
+    from pytest_embedded.utils import Meta
+
+    meta = Meta('', {}, {})
+    with caplog.at_level(logging.DEBUG):
+        meta.set_port_target_cache('/dev/ttyUSB0', 'esp32')
+        assert meta.hit_port_target_cache('/dev/ttyUSB0', 'esp32')
+
+    assert caplog.messages == [
+        'set port-target cache: /dev/ttyUSB0 - esp32',
+        'hit port-target cache: /dev/ttyUSB0 - esp32',
+    ]